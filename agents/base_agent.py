@@ -1,33 +1,112 @@
+import re
+from typing import Dict, List, Tuple
+
+from utils.scheduler import estimate_tokens
+
+# Files with at most SMALL_FILE_TOKENS (estimated) tokens of code may be packed
+# into a single request, up to BATCH_TOKEN_BUDGET tokens of code per request.
+SMALL_FILE_TOKENS = 600
+BATCH_TOKEN_BUDGET = 3000
+MAX_BATCH_FILES = 8
+
+# Response tokens allowed per file in a batched request, and overall.
+BATCH_DOC_TOKENS = 512
+MAX_BATCH_RESPONSE_TOKENS = 4096
+
+_BATCH_DOC = re.compile(r'^<<<DOC:[ \t]*([^\n]+?)[ \t]*>>>[ \t]*\n(.*?)^<<<END DOC>>>', re.MULTILINE | re.DOTALL)
+# Markers that must never appear inside a single file's documentation.
+_BATCH_MARKERS = ("<<<DOC:", "<<<FILE:")
+
+
+def estimate_code_tokens(code_info: dict) -> int:
+    return estimate_tokens(code_info.get("code", ""))
+
+
+def is_small_file(code_info: dict) -> bool:
+    return estimate_code_tokens(code_info) <= SMALL_FILE_TOKENS
+
+
+def batch_has_room(batch: List[Tuple[str, dict]], code_info: dict) -> bool:
+    """Whether a small file can join `batch` without exceeding the batch limits."""
+    if len(batch) >= MAX_BATCH_FILES:
+        return False
+    used = sum(estimate_code_tokens(item) for _, item in batch)
+    return used + estimate_code_tokens(code_info) <= BATCH_TOKEN_BUDGET
+
+
 class BaseAgent:
     def __init__(self, role_name: str, system_prompt: str):
         self.role_name = role_name
         self.system_prompt = system_prompt
 
-    def build_prompt(self, code_info: dict, file_name: str) -> str:
-        """
-        Combines the system prompt, file name, and extracted code info
-        into a complete prompt to send to the LLM.
-        """
+    def _describe(self, code_info: dict) -> str:
+        """Language, detected symbols and code of one file."""
         language = code_info.get("language", "Unknown")
         functions = code_info.get("functions", [])
         classes = code_info.get("classes", [])
-        
+
         # Add language-specific constructs
         additional_info = ""
         if "interfaces" in code_info:
             additional_info += f"Interfaces: {code_info['interfaces']}\n"
         if "traits" in code_info:
             additional_info += f"Traits: {code_info['traits']}\n"
-        
-        return f"""{self.system_prompt}
 
-File: {file_name}
-Language: {language}
+        return f"""Language: {language}
 Functions: {functions}
 Classes: {classes}
 {additional_info}
 Code:
-{code_info.get("code", "")}
+{code_info.get("code", "")}"""
+
+    def build_prompt(self, code_info: dict, file_name: str) -> str:
+        """
+        Combines the system prompt, file name, and extracted code info
+        into a complete prompt to send to the LLM.
+        """
+        language = code_info.get("language", "Unknown")
+        return f"""{self.system_prompt}
+
+File: {file_name}
+{self._describe(code_info)}
 
 Please respond as the {self.role_name}, taking into account that this is {language} code.
-"""
\ No newline at end of file
+"""
+
+    def build_batch_prompt(self, items: List[Tuple[str, dict]]) -> str:
+        """
+        Combines several small files into one prompt. Each file is wrapped in
+        `<<<FILE: name>>>` / `<<<END FILE>>>` and the model is asked to answer
+        with one `<<<DOC: name>>>` / `<<<END DOC>>>` block per file.
+        """
+        sections = "\n\n".join(
+            f"<<<FILE: {file_name}>>>\n{self._describe(code_info)}\n<<<END FILE>>>"
+            for file_name, code_info in items
+        )
+        return f"""{self.system_prompt}
+
+You are given {len(items)} separate files, each between a "<<<FILE: name>>>" line and a "<<<END FILE>>>" line.
+Document each file on its own. For every file, write a line "<<<DOC: name>>>" (using the exact file name),
+then its documentation, then a line "<<<END DOC>>>". Cover every file in the order given.
+
+{sections}
+
+Please respond as the {self.role_name}, taking into account the language of each file.
+"""
+
+    def parse_batch_response(self, response: str, file_names: List[str]) -> Dict[str, str]:
+        """
+        Split a batched response back into per-file documentation. Only files
+        with a complete, non-empty block are returned; callers fall back to
+        single-file requests for the rest. A block that runs into another
+        file's markers (a missing `<<<END DOC>>>`) is rejected.
+        """
+        expected = set(file_names)
+        docs = {}
+        for match in _BATCH_DOC.finditer(response):
+            name, doc = match.group(1), match.group(2).strip()
+            if any(marker in doc for marker in _BATCH_MARKERS):
+                continue
+            if name in expected and doc and name not in docs:
+                docs[name] = doc
+        return docs
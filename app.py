@@ -1,13 +1,18 @@
 import streamlit as st
+import hashlib
 import zipfile
 import os
 import shutil
 import uuid
 from git import Repo
 
-from utils.code_parser import extract_code_info, extract_notebook_code, get_supported_extensions
-from utils.llm_wrapper import get_doc_from_llm
-from utils.pdf_exporter import markdown_to_pdf
+from utils.code_parser import get_supported_extensions
+from utils.doc_pipeline import generate_docs
+from utils.llm_wrapper import MODEL
+from utils.result_store import ResultStore, run_key
+from utils.scheduler import Budget
+from utils.md_exporter import report_path, split_dir, write_report, write_split_report, zip_directory
+from utils.pdf_exporter import markdown_file_to_pdf
 from agents.architect import ArchitectAgent
 from agents.developer import DeveloperAgent
 from agents.user import UserAgent
@@ -51,87 +56,103 @@ for ext in supported_extensions:
 extensions_text = ", ".join([f"`.{ext}`" for ext in filtered_extensions])
 st.markdown(f"> Upload a `.zip` of your project or clone a public GitHub repo.\n\nSupports: {extensions_text}")
 
+with st.expander("⚙️ Run options"):
+    prioritize = st.checkbox(
+        "Document the most important files first",
+        value=True,
+        help="Entry points and widely imported modules first, tests and fixtures last"
+    )
+    batch_small_files = st.checkbox(
+        "Pack small files into shared requests",
+        value=True,
+        help="Tiny files are documented several at a time, saving a full request per file"
+    )
+    max_tokens = st.number_input("Stop after this many tokens (0 = no limit)", min_value=0, value=0, step=10000)
+    max_minutes = st.number_input("Stop after this many minutes (0 = no limit)", min_value=0, value=0, step=5)
+
 agents = [ArchitectAgent(), DeveloperAgent(), UserAgent()]
-docs = {}
 
-# --- Zip Upload ---
-uploaded_file = st.file_uploader("📦 Upload a .zip of your Python project", type="zip")
+# Files shown per page in the documentation preview
+PREVIEW_PAGE_SIZE = 20
 
-if uploaded_file:
-    temp_dir = "temp_code"
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    os.makedirs(temp_dir, exist_ok=True)
+# Session state only holds the key of the on-disk result store
+if 'store_key' not in st.session_state:
+    st.session_state.store_key = None
+    st.session_state.generated_for = None
 
-    with zipfile.ZipFile(uploaded_file, 'r') as zip_ref:
-        zip_ref.extractall(temp_dir)
 
-    st.success("✅ Code extracted successfully!")
+def open_store(source_id: str) -> ResultStore:
+    store = ResultStore(run_key(source_id, filtered_extensions, [a.role_name for a in agents], MODEL))
+    if store.completed:
+        st.info(f"♻️ Resuming: {store.completed} results restored from a previous run.")
+    return store
+
+
+def language_of(file_name: str) -> str:
+    file_ext = file_name.lower().split('.')[-1] if '.' in file_name else ''
+    return language_map.get(f'.{file_ext}', 'Unknown')
 
-    with st.spinner("🧠 Generating documentation using AI agents..."):
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                file_extension = file.lower().split('.')[-1] if '.' in file else ''
-                if file_extension not in [ext.lstrip('.') for ext in filtered_extensions]:
-                    continue
-
-                path = os.path.join(root, file)
-                code_info = None
-
-                if file.endswith(".ipynb"):
-                    code = extract_notebook_code(path)
-                    if code:
-                        code_info = {"code": code, "functions": [], "classes": [], "language": "Python"}
-                else:
-                    code_info = extract_code_info(path)
 
-                if not code_info:
-                    continue
+def render_file_docs(store: ResultStore, file_name: str) -> None:
+    st.subheader(f"📄 `{file_name}` ({language_of(file_name)})")
+    for role, content in store.iter_docs(file_name):
+        with st.expander(f"🧠 {role}"):
+            st.markdown(content)
 
-                file_doc = {}
-                for agent in agents:
-                    prompt = agent.build_prompt(code_info, file)
-                    doc = get_doc_from_llm(prompt)
-                    file_doc[agent.role_name] = doc
 
-                docs[file] = file_doc
+def run_generation(source_dir: str, store: ResultStore) -> None:
+    """
+    Generate docs for `source_dir` into `store`, showing progress as files
+    complete. The first page of documented files (the most important ones
+    when prioritizing) is rendered from the store as soon as each is done.
+    """
+    budget = Budget(max_tokens=max_tokens or None, max_seconds=max_minutes * 60 or None)
+    progress = st.progress(0.0, text="Scoring files...")
+    live_preview = st.empty()
+    live = live_preview.container()
+    shown = []
 
+    def on_progress(done: int, total: int, file_name: str):
+        progress.progress(done / total, text=f"📄 {file_name} ({done}/{total})")
+        if len(shown) < PREVIEW_PAGE_SIZE and store.agents(file_name):
+            shown.append(file_name)
+            with live:
+                render_file_docs(store, file_name)
+
+    with st.spinner("🧠 Generating documentation using AI agents..."):
+        generate_docs(source_dir, filtered_extensions, agents, store,
+                      prioritize=prioritize, budget=budget, on_progress=on_progress,
+                      batch_small_files=batch_small_files)
+    # The full, paged preview below replaces the live one
+    live_preview.empty()
+    if budget.exhausted:
+        st.warning("⏱️ Budget reached — the remaining files were skipped. Raise the budget to continue where this run stopped.")
+
+    st.session_state.store_key = store.key
+    # Rerunning with the same source and budget reuses the stored results as-is
+    st.session_state.generated_for = (store.key, max_tokens, max_minutes)
     st.success("📚 Documentation generated!")
 
-    for file_name, agent_docs in docs.items():
-        # Get language info from the first agent's response or file extension
-        file_ext = file_name.lower().split('.')[-1] if '.' in file_name else ''
-        language = language_map.get(f'.{file_ext}', 'Unknown')
-        st.subheader(f"📄 {file_name} ({language})")
-        for role, content in agent_docs.items():
-            with st.expander(f"🧠 {role}"):
-                st.markdown(content)
 
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        if st.button("💾 Export to Markdown"):
-            os.makedirs("docs", exist_ok=True)
-            with open("docs/auto_docs.md", "w", encoding="utf-8") as f:
-                for file_name, agent_docs in docs.items():
-                    f.write(f"\n\n### {file_name}\n")
-                    for role, content in agent_docs.items():
-                        f.write(f"\n#### {role}\n{content}\n")
-            st.success("✅ Saved to docs/auto_docs.md")
-
-            with open("docs/auto_docs.md", "r", encoding="utf-8") as f_md:
-                md = f_md.read()
-            pdf_path = markdown_to_pdf(md)
-            if pdf_path and os.path.exists(pdf_path):
-                with open(pdf_path, "rb") as f_pdf:
-                    st.download_button(
-                        label="📄 Download PDF",
-                        data=f_pdf,
-                        file_name="AutoDocs_Report.pdf",
-                        mime="application/pdf"
-                    )
-                st.success("✅ PDF generated and ready to download!")
-            else:
-                st.error("❌ Failed to generate PDF.")
+# --- Zip Upload ---
+uploaded_file = st.file_uploader("📦 Upload a .zip of your Python project", type="zip")
+
+if uploaded_file:
+    archive_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    store_key = run_key(f"zip:{archive_hash}", filtered_extensions, [a.role_name for a in agents], MODEL)
+
+    if st.session_state.generated_for != (store_key, max_tokens, max_minutes):
+        temp_dir = "temp_code"
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+        os.makedirs(temp_dir, exist_ok=True)
+
+        with zipfile.ZipFile(uploaded_file, 'r') as zip_ref:
+            zip_ref.extractall(temp_dir)
+
+        st.success("✅ Code extracted successfully!")
+
+        run_generation(temp_dir, open_store(f"zip:{archive_hash}"))
 
 
 # --- GitHub Clone Section ---
@@ -140,59 +161,14 @@ st.subheader("🐙 Clone a GitHub Python Repo Instead")
 repo_url = st.text_input("🔗 Paste public GitHub repo URL")
 use_repo = st.button("⬇️ Clone and Generate Docs")
 
-# Initialize session state for docs
-if 'docs' not in st.session_state:
-    st.session_state.docs = {}
-
 if use_repo and repo_url:
     temp_repo_dir = f"temp_repo_{uuid.uuid4().hex[:6]}"
     try:
         with st.spinner("📥 Cloning repo..."):
-            Repo.clone_from(repo_url, temp_repo_dir)
+            repo = Repo.clone_from(repo_url, temp_repo_dir)
         st.success("✅ Repo cloned!")
 
-        docs = {}
-        with st.spinner("🧠 Generating documentation using AI agents..."):
-            for root, dirs, files in os.walk(temp_repo_dir):
-                for file in files:
-                    file_extension = file.lower().split('.')[-1] if '.' in file else ''
-                    if file_extension not in [ext.lstrip('.') for ext in filtered_extensions]:
-                        continue
-
-                    path = os.path.join(root, file)
-                    code_info = None
-
-                    if file.endswith(".ipynb"):
-                        notebook_code = extract_notebook_code(path)
-                        if notebook_code:
-                            code_info = {"code": notebook_code, "functions": [], "classes": [], "language": "Python"}
-                    else:
-                        code_info = extract_code_info(path)
-
-                    if not code_info:
-                        continue
-
-                    file_doc = {}
-                    for agent in agents:
-                        prompt = agent.build_prompt(code_info, file)
-                        doc = get_doc_from_llm(prompt)
-                        file_doc[agent.role_name] = doc
-                    docs[file] = file_doc
-
-        # Store docs in session state
-        st.session_state.docs = docs
-        st.success("📚 Documentation generated!")
-
-        st.header("🧾 Documentation Preview")
-
-        for file_name, agent_docs in docs.items():
-            # Get language info from file extension
-            file_ext = file_name.lower().split('.')[-1] if '.' in file_name else ''
-            language = language_map.get(f'.{file_ext}', 'Unknown')
-            st.subheader(f"📄 `{file_name}` ({language})")
-            for role, content in agent_docs.items():
-                with st.expander(f"🧠 {role} Agent"):
-                    st.markdown(content)
+        run_generation(temp_repo_dir, open_store(f"git:{repo_url}@{repo.head.commit.hexsha}"))
 
     except Exception as e:
         st.error(f"❌ Failed to clone repository: {str(e)}")
@@ -200,43 +176,53 @@ if use_repo and repo_url:
             shutil.rmtree(temp_repo_dir)
 
 # Show docs preview and export buttons if docs exist
-if st.session_state.docs:
+store = ResultStore(st.session_state.store_key) if st.session_state.store_key else None
+if store and store.files():
+    files = store.files()
     st.markdown("---")
     st.markdown("### ✅ All docs generated! Click below to export:")
-    
-    # Show documentation preview
-    for file_name, agent_docs in st.session_state.docs.items():
-        # Get language info from file extension
-        file_ext = file_name.lower().split('.')[-1] if '.' in file_name else ''
-        language = language_map.get(f'.{file_ext}', 'Unknown')
-        st.subheader(f"📄 `{file_name}` ({language})")
-        for role, content in agent_docs.items():
-            with st.expander(f"🧠 {role} Agent"):
-                st.markdown(content)
+
+    # Show one page of the documentation preview; documents are read from disk as they are shown
+    st.header("🧾 Documentation Preview")
+    pages = (len(files) + PREVIEW_PAGE_SIZE - 1) // PREVIEW_PAGE_SIZE
+    page = st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    for file_name in files[(page - 1) * PREVIEW_PAGE_SIZE:page * PREVIEW_PAGE_SIZE]:
+        render_file_docs(store, file_name)
+
+    split_output = st.checkbox(
+        "📁 Split into one Markdown file per source file (with a package index)",
+        help="Writes an auto_docs/ folder mirroring the project layout instead of a single report"
+    )
+    markdown_path = report_path(store)
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("💾 Export to Markdown"):
-            os.makedirs("docs", exist_ok=True)
-            with open("docs/auto_docs.md", "w", encoding="utf-8") as f:
-                for file_name, agent_docs in st.session_state.docs.items():
-                    f.write(f"\n\n### {file_name}\n")
-                    for role, content in agent_docs.items():
-                        f.write(f"\n#### {role}\n{content}\n")
-            st.success("✅ Saved to docs/auto_docs.md")
-
-    # Always show the Export to PDF button if markdown exists
-    if os.path.exists("docs/auto_docs.md"):
-        with open("docs/auto_docs.md", "r", encoding="utf-8") as f_md:
-            md = f_md.read()
+            if split_output:
+                output_dir = split_dir(store)
+                index_path = write_split_report(store, output_dir)
+                zip_path = zip_directory(output_dir, output_dir + "_markdown.zip")
+                st.success(f"✅ Saved to {output_dir}/ (index: {index_path})")
+                with open(zip_path, "rb") as f_zip:
+                    st.download_button(
+                        label="⬇️ Download Markdown (.zip)",
+                        data=f_zip,
+                        file_name="AutoDocs_Markdown.zip",
+                        mime="application/zip"
+                    )
+            else:
+                write_report(store, markdown_path)
+                st.success(f"✅ Saved to {markdown_path}")
 
+    # Always show the Export to PDF button if markdown exists; the report is only read when a PDF is requested
+    if os.path.exists(markdown_path):
         st.markdown("---")
         st.subheader("📄 Export Markdown to PDF")
 
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("📄 Export to PDF"):
-                pdf_path = markdown_to_pdf(md)
+                pdf_path = markdown_file_to_pdf(markdown_path)
                 if pdf_path and os.path.exists(pdf_path):
                     with open(pdf_path, "rb") as f_pdf:
                         st.download_button(
@@ -247,4 +233,4 @@ if st.session_state.docs:
                         )
                     st.success("✅ PDF generated and ready to download!")
                 else:
-                    st.error("❌ Failed to generate PDF.")
\ No newline at end of file
+                    st.error("❌ Failed to generate PDF.")
@@ -0,0 +1,57 @@
+"""
+Benchmark the C-family lexer on pathological inputs.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lexer
+
+Each case is generated at increasing sizes; a linear parser keeps the
+time per MB roughly constant as the input grows. The legacy Java method
+and call-style regexes are timed on the same inputs (at the smaller sizes only) for comparison.
+"""
+import re
+import time
+
+from utils.code_parser import PARSE_TIME_BUDGET, scan_c_family_symbols
+
+LEGACY_PATTERNS = [
+    re.compile(r'(?:public|private|protected|static|\s) +[\w\<\>\[\]]+\s+(\w+) *\([^\)]*\) *\{?[^\{]*\{'),
+    re.compile(r'(\w+)\s*\([^)]*\)\s*\{'),
+]
+
+SIZES = [16_000, 64_000, 256_000, 1_024_000]
+LEGACY_MAX_SIZE = 64_000
+
+CASES = {
+    "unclosed parens": ("Java", lambda n: "a(" * (n // 2)),
+    "modifier run": ("Java", lambda n: "public " * (n // 7)),
+    "no opening brace": ("Java", lambda n: "public int f() x\n" * (n // 17)),
+    "comments in unclosed calls": ("C++", lambda n: "f( /* c */ " * (n // 12)),
+    "nested comments": ("Rust", lambda n: "/* " * (n // 6) + "*/ " * (n // 6)),
+    "unterminated strings": ("JavaScript", lambda n: 'f("\n' * (n // 4)),
+    "generic methods": ("TypeScript", lambda n: "m(a: T): Promise<void> { }\n" * (n // 27)),
+}
+
+
+def _time(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"per-file time budget: {PARSE_TIME_BUDGET}s\n")
+    print(f"{'case':<28}{'size':>10}{'lexer s':>10}{'MB/s':>9}{'legacy s':>10}")
+    for name, (language, generate) in CASES.items():
+        for size in SIZES:
+            source = generate(size)
+            elapsed = _time(lambda: scan_c_family_symbols(source, language))
+            legacy = "-"
+            if size <= LEGACY_MAX_SIZE:
+                legacy = f"{_time(lambda: [list(p.finditer(source)) for p in LEGACY_PATTERNS]):.3f}"
+            throughput = len(source) / 1e6 / elapsed if elapsed else float("inf")
+            print(f"{name:<28}{len(source):>10}{elapsed:>10.3f}{throughput:>9.2f}{legacy:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark the notebook reader on large synthetic notebooks.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_notebook
+
+Each notebook mixes code cells with base64 image outputs, which dominate
+the file size the way plots do in real notebooks. The fast reader is
+compared with the previous nbformat-based implementation.
+"""
+import base64
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import nbformat
+
+from utils.code_parser import extract_notebook_chunks, extract_notebook_code
+
+CELL_COUNTS = [100, 500, 2000]
+IMAGE_BYTES = 32_000
+
+
+def legacy_extract_notebook_code(file_path):
+    nb = nbformat.read(file_path, as_version=4)
+    code = ""
+    for cell in nb.cells:
+        if cell.cell_type == "code":
+            code += cell.source + "\n\n"
+    return code.strip()
+
+
+def make_notebook(cell_count: int, image_bytes: int = IMAGE_BYTES) -> dict:
+    """A v4 notebook with `cell_count` code cells, each with an `image_bytes` PNG output."""
+    image = base64.b64encode(os.urandom(image_bytes)).decode("ascii")
+    cells = []
+    for i in range(cell_count):
+        if i % 5 == 0:
+            cells.append({"cell_type": "markdown", "metadata": {}, "source": [f"## Section {i}\n"]})
+        cells.append({
+            "cell_type": "code",
+            "execution_count": i,
+            "metadata": {},
+            "source": [f"def step_{i}(x):\n", f"    return x * {i}\n", f"plot(step_{i})\n"],
+            "outputs": [{
+                "output_type": "display_data",
+                "metadata": {},
+                "data": {"image/png": image, "text/plain": ["<Figure>"]},
+            }],
+        })
+    return {
+        "nbformat": 4,
+        "nbformat_minor": 5,
+        "metadata": {"kernelspec": {"name": "python3", "display_name": "Python 3", "language": "python"}},
+        "cells": cells,
+    }
+
+
+def _measure(func, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main() -> None:
+    print(f"{'cells':>7}{'file MB':>9}{'legacy s':>10}{'fast s':>9}{'speedup':>9}{'legacy MB':>11}{'fast MB':>9}{'chunks':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for cell_count in CELL_COUNTS:
+            path = os.path.join(tmp, f"nb_{cell_count}.ipynb")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(make_notebook(cell_count), f)
+
+            legacy, legacy_s, legacy_mb = _measure(legacy_extract_notebook_code, path)
+            fast, fast_s, fast_mb = _measure(extract_notebook_code, path)
+            assert fast == legacy, "fast reader output differs from nbformat"
+            chunks = extract_notebook_chunks(path)
+
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{cell_count:>7}{size_mb:>9.1f}{legacy_s:>10.3f}{fast_s:>9.3f}{legacy_s / fast_s:>8.1f}x"
+                  f"{legacy_mb:>11.1f}{fast_mb:>9.1f}{len(chunks):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Parser micro-benchmarks across every supported language.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parsers                    # compare with the baseline
+    python -m benchmarks.bench_parsers --update-baseline  # record a new baseline
+    python -m benchmarks.bench_parsers --quick            # smallest size only
+
+For each language a synthetic source file is generated at increasing sizes,
+both as realistic code and as adversarial input (unbalanced brackets,
+unterminated strings, comments inside unclosed calls). `extract_code_info`
+is timed on each file and `extract_notebook_code` on notebooks built by
+`bench_notebook`, recording throughput (MB/s and symbols/s) and peak
+traced memory.
+
+Results are compared with the baseline file. The run fails (exit code 1)
+when throughput drops or peak memory grows by more than `--tolerance`.
+Absolute numbers depend on the machine, so record the baseline on the
+machine that runs the comparison; it is not committed. A missing baseline
+is an error unless `--update-baseline` is given.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.bench_notebook import make_notebook
+from utils.code_parser import extract_code_info, extract_notebook_code
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "parser_baseline.json")
+SIZES = [64_000, 256_000, 1_024_000]
+REPEATS = 3
+# Roughly the code characters per cell of `bench_notebook.make_notebook`
+NOTEBOOK_CELL_CHARS = 50
+NOTEBOOK_IMAGE_BYTES = 1024
+
+# One unit of realistic code per extension; `{i}` makes every symbol unique.
+TEMPLATES: Dict[str, str] = {
+    "py": 'class Model{i}:\n    """Doc {i}."""\n    def run_{i}(self, x):\n        # call helper\n        return helper_{i}(x, "s{i}")\n\ndef helper_{i}(x, s):\n    return x\n\n',
+    "cpp": '// helper {i}\nclass Widget{i} {{ public: int size() const; }};\nint Widget{i}::size() const {{ return {i}; }}\nstatic int compute_{i}(int a, const char* s = "x(") {{ if (a) {{ return a; }} return 0; }}\n',
+    "java": '/** Doc {i} */\npublic class Service{i} {{\n    private int count{i};\n    public List<String> load_{i}(int a) throws IOException {{ if (a > 0) {{ run("x{{"); }} return null; }}\n}}\n',
+    "js": '// util {i}\nfunction handler_{i}(req, res) {{ if (req) {{ res.send(`ok ${{req}}`); }} }}\nconst arrow_{i} = (a, b) => a + b;\nclass View{i} {{ render(props) {{ return "<div>"; }} }}\n',
+    "ts": 'interface Props{i} {{ id: number; }}\ntype Alias{i} = Props{i}[];\nexport const make_{i} = (p: Props{i}): Alias{i} => [p];\nclass Store{i} {{ get(id: number): Promise<Props{i}> {{ return fetch("/x"); }} }}\n',
+    "go": '// Server{i} serves\ntype Server{i} struct {{ port int }}\nfunc (s *Server{i}) Start_{i}(addr string) error {{ raw := `func fake() {{`; return nil }}\nfunc helper_{i}() int {{ return {i} }}\n',
+    "rs": '/// doc {i}\npub struct Point{i}<\'a> {{ name: &\'a str }}\ntrait Shape{i} {{ fn area(&self) -> f64; }}\nimpl<\'a> Point{i}<\'a> {{ fn new_{i}(c: char) -> Self {{ let r = r#"fn x()"#; todo!() }} }}\n',
+    "cs": '// Repo {i}\npublic class Repo{i} : Base {{\n    public Repo{i}(int a) : base(a) {{ }}\n    public async Task<int> Save_{i}(string s) {{ var p = @"C:\\path{i}"; return 1; }}\n}}\n',
+    "php": '<?php\n# helper {i}\nclass Controller{i} {{ public function action_{i}($req) {{ return "function x()"; }} }}\nfunction util_{i}($a) {{ return $a; }}\n',
+    "rb": '# Model {i}\nclass Record{i} < Base\n  def save_{i}(attrs)\n    puts "def fake"\n  end\n  def self.find_{i}(id)\n    nil\n  end\nend\n',
+    "swift": '/* View {i} */\nclass Controller{i}: UIViewController {{\n    func load_{i}(id: Int) -> String {{ return "func x()" }}\n}}\nprotocol Delegate{i} {{}}\n',
+    "kt": '// repo {i}\ndata class User{i}(val name: String)\nfun <T> List<T>.second_{i}(): T = this[1]\nobject Registry{i} {{ fun register_{i}(u: User{i}) {{ println("fun x()") }} }}\n',
+    "scala": '// actor {i}\ncase class Msg{i}(text: String)\ntrait Handler{i} {{ def handle_{i}(m: Msg{i}): Unit }}\nobject Main{i} {{ def run_{i}(args: Array[String]) = println("def x") }}\n',
+}
+
+# Inputs that defeat naive regex scanning: each must stay linear. Every unit
+# closes its own comments, so the whole file stays adversarial when repeated.
+ADVERSARIAL: Dict[str, str] = {
+    "py": 'x = "' + "a(" * 40 + '"\n',
+    "cpp": "f( /* c */ ",
+    "java": "public static int f() x\n",
+    "js": 'g("\n',
+    "ts": "m(a: T): Promise<",
+    "go": "func (",
+    "rs": "f( /* /* c */ */ ",
+    "cs": "public int f(",
+    "php": "function (",
+    "rb": "def self.",
+    "swift": "class func ",
+    "kt": "fun <T> ",
+    "scala": "def f(",
+}
+
+
+def _repeat_to(template: Callable[[int], str], size: int) -> str:
+    parts: List[str] = []
+    total, i = 0, 0
+    while total < size:
+        chunk = template(i)
+        parts.append(chunk)
+        total += len(chunk)
+        i += 1
+    return "".join(parts)
+
+
+def make_source(ext: str, size: int, adversarial: bool) -> str:
+    if adversarial:
+        unit = ADVERSARIAL[ext]
+        return _repeat_to(lambda i: unit, size)
+    template = TEMPLATES[ext]
+    return _repeat_to(lambda i: template.format(i=i), size)
+
+
+def _symbol_count(info) -> int:
+    if not info:
+        return 0
+    return sum(len(info.get(key, [])) for key in ("functions", "classes", "interfaces", "traits"))
+
+
+def measure(func: Callable[[str], object], path: str, count_symbols: bool = True) -> Dict[str, float]:
+    """Best-of-REPEATS timing plus peak traced memory of one call."""
+    size_mb = os.path.getsize(path) / 1e6
+    best = float("inf")
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = max(best, 1e-9)
+    symbols = _symbol_count(result) if count_symbols else 0
+    return {
+        "seconds": round(best, 6),
+        "mb_per_s": round(size_mb / best, 3),
+        "symbols_per_s": round(symbols / best, 1),
+        "peak_mb": round(peak / 1e6, 3),
+    }
+
+
+def run_suite(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in TEMPLATES:
+            for adversarial in (False, True):
+                for size in sizes:
+                    name = f"{ext}/{'adversarial' if adversarial else 'typical'}/{size}"
+                    path = os.path.join(tmp, f"bench.{ext}")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(make_source(ext, size, adversarial))
+                    results[name] = measure(extract_code_info, path)
+                    print(_format(name, results[name]))
+
+        for size in sizes:
+            name = f"ipynb/typical/{size}"
+            path = os.path.join(tmp, "bench.ipynb")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(make_notebook(max(1, size // NOTEBOOK_CELL_CHARS), NOTEBOOK_IMAGE_BYTES), f)
+            results[name] = measure(extract_notebook_code, path, count_symbols=False)
+            print(_format(name, results[name]))
+    return results
+
+
+def _format(name: str, r: Dict[str, float]) -> str:
+    return f"{name:<28}{r['seconds']:>10.4f}s{r['mb_per_s']:>10.2f} MB/s{r['symbols_per_s']:>12.0f} sym/s{r['peak_mb']:>9.2f} MB"
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Describe every case whose throughput or peak memory regressed beyond `tolerance`."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["mb_per_s"] < previous["mb_per_s"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['mb_per_s']:.2f} -> {current['mb_per_s']:.2f} MB/s")
+        # Ignore tiny absolute changes in memory, which are mostly noise
+        if current["peak_mb"] > previous["peak_mb"] * (1 + tolerance) + 0.5:
+            regressions.append(f"{name}: peak memory {previous['peak_mb']:.2f} -> {current['peak_mb']:.2f} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (default 0.25)")
+    parser.add_argument("--quick", action="store_true", help="only run the smallest size")
+    args = parser.parse_args()
+
+    results = run_suite(SIZES[:1] if args.quick else SIZES)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ No baseline at {args.baseline}; record one with --update-baseline")
+        return 1
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
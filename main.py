@@ -0,0 +1,99 @@
+"""
+AutoDocs batch runner: queue repositories and document them with worker processes.
+
+    python main.py submit https://github.com/org/repo.git path/to/project.zip
+    python main.py work --workers 8 --llm-concurrency 4
+    python main.py status
+    python main.py cancel 12
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from utils.code_parser import get_supported_extensions
+from utils.job_queue import DEFAULT_LLM_CONCURRENCY, DEFAULT_WORKERS, JOBS_DB, JobQueue
+
+
+def _time(timestamp) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M") if timestamp else "-"
+
+
+def cmd_submit(args) -> int:
+    queue = JobQueue(args.db)
+    extensions = args.ext or get_supported_extensions()
+    status = 0
+    for source in args.sources:
+        try:
+            print(f"📥 job {queue.submit(source, extensions)}: {source}")
+        except ValueError as e:
+            print(f"❌ {e}")
+            status = 1
+    return status
+
+
+def cmd_status(args) -> int:
+    queue = JobQueue(args.db)
+    jobs = [queue.get(args.job_id)] if args.job_id else queue.list_jobs()
+    if not jobs or jobs[0] is None:
+        print("No jobs.")
+        return 0 if not args.job_id else 1
+    print(f"{'id':>5}  {'status':<10}{'files':>11}  {'submitted':<17}{'finished':<17}source")
+    for job in jobs:
+        files = f"{job['files_done']}/{job['files_total']}"
+        print(f"{job['id']:>5}  {job['status']:<10}{files:>11}  {_time(job['submitted_at']):<17}{_time(job['finished_at']):<17}{job['source']}")
+        if job["output_dir"]:
+            print(f"{'':>7}📄 {job['output_dir']}")
+        if job["error"]:
+            print(f"{'':>7}❌ {job['error']}")
+    return 0
+
+
+def cmd_cancel(args) -> int:
+    if JobQueue(args.db).cancel(args.job_id):
+        print(f"🛑 job {args.job_id} cancelled")
+        return 0
+    print(f"job {args.job_id} is not queued or running")
+    return 1
+
+
+def cmd_work(args) -> int:
+    # Imported here so queue management works without LLM credentials
+    from utils.job_worker import run_workers
+    run_workers(args.workers, args.db, args.llm_concurrency, args.exit_when_idle)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="AutoDocs batch documentation queue")
+    parser.add_argument("--db", default=JOBS_DB, help="job queue database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="queue git URLs or .zip archives")
+    submit.add_argument("sources", nargs="+")
+    submit.add_argument("--ext", action="append", help="extension to document, e.g. --ext .py (repeatable; default: all)")
+    submit.set_defaults(func=cmd_submit)
+
+    status = commands.add_parser("status", help="show jobs")
+    status.add_argument("job_id", nargs="?", type=int)
+    status.set_defaults(func=cmd_status)
+
+    cancel = commands.add_parser("cancel", help="cancel a queued or running job")
+    cancel.add_argument("job_id", type=int)
+    cancel.set_defaults(func=cmd_cancel)
+
+    work = commands.add_parser("work", help="run worker processes")
+    work.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    work.add_argument(
+        "--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY,
+        help="max LLM requests in flight across all workers (each worker sends one at a time, "
+             "so only a value below --workers has an effect)",
+    )
+    work.add_argument("--exit-when-idle", action="store_true", help="stop once the queue is empty")
+    work.set_defaults(func=cmd_work)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,94 @@
 import ast
+import json
 import nbformat
 import re
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils.lexer import LexerTimeout, is_identifier, match_brackets, tokenize
+
+# Hard wall-clock budget (seconds) for symbol detection in a single file.
+# When it runs out, the symbols found so far are returned.
+PARSE_TIME_BUDGET = 5.0
+
+# Notebooks larger than this (in characters of code) are documented in
+# several chunks of consecutive cells.
+NOTEBOOK_CHUNK_CHARS = 12000
+
+# How far (in tokens) to look past a declaration for its body or arrow.
+_LOOKAHEAD = 48
+
+# Statement keywords that can precede `(...) {` in every call-style language.
+_STATEMENT_KEYWORDS = frozenset(("if", "else", "for", "while", "do", "switch", "case", "catch", "try", "return", "throw", "new"))
+
+# Words that can follow a type keyword without naming a type (e.g. Swift `class func`).
+_NOT_TYPES = {"func", "var", "let", "fun", "val", "def", "fn", "extends", "implements"}
+# C++ access labels; a `:` after them does not start a constructor init list.
+_ACCESS_SPECIFIERS = {"public", "private", "protected"}
+
+# Symbol detection rules for the C-family languages:
+#   types       - keyword -> result bucket for the name that follows it
+#   followed_by - tokens one of which must follow the type name (Go `type X struct`)
+#   functions   - keywords introducing a function name (`fn`, `func`, ...)
+#   receivers   - `func (r T) Name(` declares a method (Go)
+#   call_style  - `name(...) ... {` declares a function (C/Java style)
+#   not_functions - words that can precede `(...) {` there without naming a function
+#   qualifiers  - words allowed between the parameter list and the body (`const`)
+#   tails       - tokens starting a type list there (`throws X, Y`, `-> T`, `: T`)
+#   init_lists  - `: member(x), other(y) {` is a constructor initializer, not a function
+#   arrows      - `const name = (...) =>` declares a function (JS style)
+C_FAMILY_SYMBOLS: Dict[str, Dict] = {
+    "C++": {
+        "types": {"class": "classes", "struct": "classes"},
+        "call_style": True,
+        "not_functions": _STATEMENT_KEYWORDS | {
+            "delete", "sizeof", "alignof", "alignas", "decltype", "noexcept", "typeid", "static_assert", "defined",
+        },
+        "qualifiers": {"const", "volatile", "noexcept", "override", "final", "&"},
+        "tails": {"->"},
+        "init_lists": True,
+    },
+    "Java": {
+        "types": {"class": "classes", "interface": "classes", "enum": "classes"},
+        "call_style": True,
+        "not_functions": _STATEMENT_KEYWORDS | {"synchronized"},
+        "tails": {"throws"},
+    },
+    "JavaScript": {
+        "types": {"class": "classes"},
+        "functions": {"function"},
+        "call_style": True,
+        "not_functions": _STATEMENT_KEYWORDS | {"function", "typeof", "await", "yield", "with"},
+        "arrows": True,
+    },
+    "TypeScript": {
+        "types": {"class": "classes", "interface": "interfaces", "type": "classes"},
+        "followed_by": {"type": {"=", "<"}},
+        "functions": {"function"},
+        "call_style": True,
+        "not_functions": _STATEMENT_KEYWORDS | {"function", "typeof", "await", "yield", "with"},
+        "tails": {":"},
+        "arrows": True,
+    },
+    "Go": {"types": {"type": "classes"}, "followed_by": {"type": {"struct"}}, "functions": {"func"}, "receivers": True},
+    "Rust": {"types": {"struct": "classes", "trait": "traits"}, "functions": {"fn"}},
+    "C#": {
+        "types": {"class": "classes", "interface": "classes", "struct": "classes"},
+        "call_style": True,
+        "not_functions": _STATEMENT_KEYWORDS | {
+            "foreach", "using", "lock", "fixed", "checked", "unchecked", "typeof", "sizeof", "nameof", "when",
+        },
+        "tails": {"where"},
+        "init_lists": True,
+    },
+    "PHP": {"types": {"class": "classes", "interface": "classes", "trait": "classes"}, "functions": {"function"}},
+    "Swift": {
+        "types": {"class": "classes", "struct": "classes", "enum": "classes", "protocol": "classes"},
+        "functions": {"func"},
+    },
+    "Kotlin": {"types": {"class": "classes", "interface": "classes", "object": "classes"}, "functions": {"fun"}},
+    "Scala": {"types": {"class": "classes", "trait": "classes", "object": "classes"}, "functions": {"def"}},
+}
 
 def extract_code_info(file_path: str) -> Optional[Dict]:
     """Extract code information from various programming language files."""
@@ -51,276 +138,224 @@ def parse_python(source_code: str) -> Dict:
     classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
     return {"code": source_code, "functions": functions, "classes": classes, "language": "Python"}
 
+def _skip_angles(tokens: List[str], i: int) -> int:
+    """Return the index just past a `<...>` group starting at `i` (bounded)."""
+    depth = 0
+    for k in range(i, min(i + _LOOKAHEAD, len(tokens))):
+        if tokens[k] == "<":
+            depth += 1
+        elif tokens[k] == ">":
+            depth -= 1
+            if depth == 0:
+                return k + 1
+    return i
+
+def _keyword_function_name(tokens: List[str], i: int, parens: Dict[int, int], receivers: bool) -> Optional[str]:
+    """Name declared by a function keyword at `i`, e.g. `func (r T) Name(`,
+    `fun <T> List<T>.name(` or `function* name(`."""
+    n = len(tokens)
+    k = i + 1
+    if k < n and tokens[k] in ("*", "&"):
+        k += 1
+    if k < n and tokens[k] == "(":
+        # A method receiver, `func (r T) Name(`; otherwise an anonymous function
+        after = parens.get(k, n) + 1
+        if not (receivers and after + 1 < n and is_identifier(tokens[after]) and tokens[after + 1] in ("(", "<", "[")):
+            return None
+        k = after
+    if k < n and tokens[k] == "<":
+        k = _skip_angles(tokens, k)
+    name = None
+    while k < n and is_identifier(tokens[k]):
+        name = tokens[k]
+        k += 1
+        if k < n and tokens[k] == "<":
+            k = _skip_angles(tokens, k)
+        if k + 1 < n and tokens[k] == "." and is_identifier(tokens[k + 1]):
+            k += 1
+        else:
+            break
+    return name
+
+def _skip_braces(tokens: List[str], k: int, end: int) -> int:
+    """Index of the `}` closing the `{` at `k`, or `end` if not found in range."""
+    depth = 0
+    for j in range(k, end):
+        if tokens[j] == "{":
+            depth += 1
+        elif tokens[j] == "}":
+            depth -= 1
+            if depth == 0:
+                return j
+    return end
+
+# Tokens that may appear in a return or exception type list (`-> std::vector<int>`).
+_TYPE_PUNCTUATION = frozenset((".", "::", ",", "<", ">", "[", "]", "*", "&", "|", ":"))
+
+def _call_style_function_name(tokens: List[str], i: int, parens: Dict[int, int], rules: Dict) -> Optional[str]:
+    """Name of a function whose parameter list opens at `i` and which is
+    followed by a body, e.g. `int Foo::bar(int x) const {`. Only qualifiers,
+    a return/exception type list or a constructor init list may sit between
+    the parameter list and the body, so calls in `if (f(x)) {` are skipped."""
+    name = tokens[i - 1]
+    if not is_identifier(name) or name in rules.get("not_functions", _STATEMENT_KEYWORDS) or i not in parens:
+        return None
+    if i >= 2 and tokens[i - 2] in ("new", ".", "->", "@", "?"):
+        return None
+    owner = i - 2
+    if owner >= 0 and tokens[owner] == "~":
+        name, owner = "~" + name, owner - 1
+    if owner >= 1 and tokens[owner] == "::" and is_identifier(tokens[owner - 1]):
+        name = f"{tokens[owner - 1]}::{name}"
+
+    qualifiers = rules.get("qualifiers", ())
+    tails = rules.get("tails", ())
+    init_lists = rules.get("init_lists", False)
+    in_tail = in_init_list = False
+    k, end = parens[i] + 1, min(parens[i] + 1 + _LOOKAHEAD, len(tokens))
+    while k < end:
+        token = tokens[k]
+        if token == "(" and k in parens and (in_init_list or tokens[k - 1] in ("noexcept", "decltype", "new")):
+            k = parens[k]
+        elif token == "{":
+            if not (in_init_list and is_identifier(tokens[k - 1])):
+                return name
+            # Brace initializer of a member: `x_{0}`
+            k = _skip_braces(tokens, k, end)
+        elif in_init_list:
+            if not (is_identifier(token) or token in ("::", ".", "<", ">", ",")):
+                return None
+        elif in_tail:
+            if not (is_identifier(token) or token in _TYPE_PUNCTUATION) or tokens[k - 1] == token == "|":
+                return None
+        elif token == ":" and init_lists:
+            in_init_list = True
+        elif token in tails:
+            in_tail = True
+        elif token not in qualifiers:
+            return None
+        k += 1
+    return None
+
+def _arrow_function_name(tokens: List[str], i: int, parens: Dict[int, int]) -> Optional[str]:
+    """Name bound by `const name[: T] = [async] (...)[: T] =>` or `= function`."""
+    n = len(tokens)
+    if i + 1 >= n or not is_identifier(tokens[i + 1]):
+        return None
+    k, end = i + 2, min(i + 2 + _LOOKAHEAD, n)
+    while k < end and tokens[k] not in ("=", ";"):
+        k += 1
+    if k >= end or tokens[k] != "=":
+        return None
+    k += 1
+    if k < n and tokens[k] == "async":
+        k += 1
+    if k < n and tokens[k] == "function":
+        return tokens[i + 1]
+    if k + 1 < n and is_identifier(tokens[k]) and tokens[k + 1] == "=>":
+        return tokens[i + 1]
+    if k < n and tokens[k] == "(" and k in parens:
+        k, end = parens[k] + 1, min(parens[k] + 1 + _LOOKAHEAD, n)
+        while k < end and tokens[k] not in ("=>", "=", ";", "{"):
+            k += 1
+        if k < end and tokens[k] == "=>":
+            return tokens[i + 1]
+    return None
+
+def scan_c_family_symbols(source_code: str, language: str, time_budget: float = PARSE_TIME_BUDGET) -> Dict[str, List[str]]:
+    """
+    Detect functions and types in C-family source in linear time.
+
+    The source is tokenized once (comments and strings skipped) and every
+    declaration rule looks at most `_LOOKAHEAD` tokens ahead. If the time
+    budget runs out, whatever was found up to that point is returned.
+    """
+    rules = C_FAMILY_SYMBOLS[language]
+    deadline = time.perf_counter() + time_budget
+    try:
+        tokens = tokenize(source_code, language, deadline)
+    except LexerTimeout as e:
+        tokens = e.tokens
+
+    symbols: Dict[str, Dict[str, None]] = {"functions": {}, "classes": {}, "interfaces": {}, "traits": {}}
+    types = rules.get("types", {})
+    followed_by = rules.get("followed_by", {})
+    function_keywords = rules.get("functions", set())
+    receivers = rules.get("receivers", False)
+    call_style = rules.get("call_style", False)
+    init_lists = rules.get("init_lists", False)
+    arrows = rules.get("arrows", False)
+    parens = match_brackets(tokens)
+
+    for i, token in enumerate(tokens):
+        if i & 4095 == 0 and time.perf_counter() > deadline:
+            break
+        name = None
+        if token in types and i + 1 < len(tokens):
+            candidate = tokens[i + 1]
+            if is_identifier(candidate) and candidate not in _NOT_TYPES:
+                if token not in followed_by or (i + 2 < len(tokens) and tokens[i + 2] in followed_by[token]):
+                    symbols[types[token]][candidate] = None
+            continue
+        if arrows and token == "function" and i >= 2 and tokens[i - 1] == ":" and is_identifier(tokens[i - 2]):
+            name = tokens[i - 2]
+        elif token in function_keywords:
+            name = _keyword_function_name(tokens, i, parens, receivers)
+        elif call_style and token == "(" and i > 0:
+            if not (init_lists and i >= 2 and tokens[i - 2] in (":", ",") and not _after_access_specifier(tokens, i - 2)):
+                name = _call_style_function_name(tokens, i, parens, rules)
+        elif arrows and token in ("const", "let", "var"):
+            name = _arrow_function_name(tokens, i, parens)
+        if name:
+            symbols["functions"][name] = None
+
+    return {bucket: list(names) for bucket, names in symbols.items()}
+
+def _after_access_specifier(tokens: List[str], colon: int) -> bool:
+    """Whether the `:` at `colon` ends a C++ access label such as `public:`."""
+    return tokens[colon] == ":" and colon >= 1 and tokens[colon - 1] in _ACCESS_SPECIFIERS
+
+def _parse_c_family(source_code: str, language: str) -> Dict:
+    symbols = scan_c_family_symbols(source_code, language)
+    result = {"code": source_code, "functions": symbols["functions"], "classes": symbols["classes"]}
+    if language == "TypeScript":
+        result["interfaces"] = symbols["interfaces"]
+    elif language == "Rust":
+        result["traits"] = symbols["traits"]
+    result["language"] = language
+    return result
+
 def parse_cpp(source_code: str) -> Dict:
-    """Parse C++ code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Function patterns (simplified)
-    func_patterns = [
-        r'\w+\s+(\w+)\s*\([^)]*\)\s*\{',  # Basic function
-        r'(\w+)\s*\([^)]*\)\s*\{',        # Function without return type
-        r'(\w+)\s*::\s*(\w+)\s*\([^)]*\)\s*\{',  # Class method
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'struct\s+(\w+)',
-        r'template\s*<[^>]*>\s*class\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            if len(match.groups()) == 1:
-                functions.append(match.group(1))
-            elif len(match.groups()) == 2:
-                functions.append(f"{match.group(1)}::{match.group(2)}")
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "C++"}
+    """Parse C++ code using the C-family lexer."""
+    return _parse_c_family(source_code, "C++")
 
 def parse_java(source_code: str) -> Dict:
-    """Parse Java code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Method patterns
-    method_patterns = [
-        r'(?:public|private|protected|static|\s) +[\w\<\>\[\]]+\s+(\w+) *\([^\)]*\) *\{?[^\{]*\{',
-        r'(\w+)\s*\([^)]*\)\s*\{',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'public\s+class\s+(\w+)',
-        r'interface\s+(\w+)',
-        r'enum\s+(\w+)',
-    ]
-    
-    for pattern in method_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "Java"}
+    """Parse Java code using the C-family lexer."""
+    return _parse_c_family(source_code, "Java")
 
 def parse_javascript(source_code: str) -> Dict:
-    """Parse JavaScript code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Function patterns
-    func_patterns = [
-        r'function\s+(\w+)\s*\(',
-        r'const\s+(\w+)\s*=\s*\([^)]*\)\s*=>',
-        r'let\s+(\w+)\s*=\s*\([^)]*\)\s*=>',
-        r'var\s+(\w+)\s*=\s*\([^)]*\)\s*=>',
-        r'(\w+)\s*:\s*function\s*\(',
-        r'(\w+)\s*\([^)]*\)\s*\{',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "JavaScript"}
+    """Parse JavaScript code using the C-family lexer."""
+    return _parse_c_family(source_code, "JavaScript")
 
 def parse_typescript(source_code: str) -> Dict:
-    """Parse TypeScript code using regex patterns."""
-    functions = []
-    classes = []
-    interfaces = []
-    
-    # Function patterns (including TypeScript specific)
-    func_patterns = [
-        r'function\s+(\w+)\s*\(',
-        r'const\s+(\w+)\s*:\s*[^=]*=\s*\([^)]*\)\s*=>',
-        r'let\s+(\w+)\s*:\s*[^=]*=\s*\([^)]*\)\s*=>',
-        r'(\w+)\s*\([^)]*\)\s*:\s*[^{]*\{',
-    ]
-    
-    # Class and interface patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'interface\s+(\w+)',
-        r'type\s+(\w+)\s*=',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            if 'interface' in pattern:
-                interfaces.append(match.group(1))
-            elif 'type' in pattern:
-                classes.append(match.group(1))
-            else:
-                classes.append(match.group(1))
-    
-    return {
-        "code": source_code, 
-        "functions": list(set(functions)), 
-        "classes": list(set(classes)), 
-        "interfaces": list(set(interfaces)),
-        "language": "TypeScript"
-    }
+    """Parse TypeScript code using the C-family lexer."""
+    return _parse_c_family(source_code, "TypeScript")
 
 def parse_go(source_code: str) -> Dict:
-    """Parse Go code using regex patterns."""
-    functions = []
-    structs = []
-    
-    # Function patterns
-    func_patterns = [
-        r'func\s+(\w+)\s*\(',
-        r'func\s*\([^)]*\)\s*(\w+)\s*\(',
-    ]
-    
-    # Struct patterns
-    struct_patterns = [
-        r'type\s+(\w+)\s+struct',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in struct_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            structs.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(structs)), "language": "Go"}
+    """Parse Go code using the C-family lexer."""
+    return _parse_c_family(source_code, "Go")
 
 def parse_rust(source_code: str) -> Dict:
-    """Parse Rust code using regex patterns."""
-    functions = []
-    structs = []
-    traits = []
-    
-    # Function patterns
-    func_patterns = [
-        r'fn\s+(\w+)\s*\(',
-        r'impl\s+[^{]*\{\s*fn\s+(\w+)\s*\(',
-    ]
-    
-    # Struct and trait patterns
-    struct_patterns = [
-        r'struct\s+(\w+)',
-        r'trait\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in struct_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            if 'trait' in pattern:
-                traits.append(match.group(1))
-            else:
-                structs.append(match.group(1))
-    
-    return {
-        "code": source_code, 
-        "functions": list(set(functions)), 
-        "classes": list(set(structs)), 
-        "traits": list(set(traits)),
-        "language": "Rust"
-    }
+    """Parse Rust code using the C-family lexer."""
+    return _parse_c_family(source_code, "Rust")
 
 def parse_csharp(source_code: str) -> Dict:
-    """Parse C# code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Method patterns
-    method_patterns = [
-        r'(?:public|private|protected|internal|\s) +[\w\<\>\[\]]+\s+(\w+)\s*\([^\)]*\)\s*\{',
-        r'(\w+)\s*\([^)]*\)\s*\{',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'public\s+class\s+(\w+)',
-        r'interface\s+(\w+)',
-        r'struct\s+(\w+)',
-    ]
-    
-    for pattern in method_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "C#"}
+    """Parse C# code using the C-family lexer."""
+    return _parse_c_family(source_code, "C#")
 
 def parse_php(source_code: str) -> Dict:
-    """Parse PHP code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Function patterns
-    func_patterns = [
-        r'function\s+(\w+)\s*\(',
-        r'public\s+function\s+(\w+)\s*\(',
-        r'private\s+function\s+(\w+)\s*\(',
-        r'protected\s+function\s+(\w+)\s*\(',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'interface\s+(\w+)',
-        r'trait\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "PHP"}
+    """Parse PHP code using the C-family lexer."""
+    return _parse_c_family(source_code, "PHP")
 
 def parse_ruby(source_code: str) -> Dict:
     """Parse Ruby code using regex patterns."""
@@ -352,111 +387,101 @@ def parse_ruby(source_code: str) -> Dict:
     return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "Ruby"}
 
 def parse_swift(source_code: str) -> Dict:
-    """Parse Swift code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Function patterns
-    func_patterns = [
-        r'func\s+(\w+)\s*\(',
-        r'static\s+func\s+(\w+)\s*\(',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'struct\s+(\w+)',
-        r'enum\s+(\w+)',
-        r'protocol\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "Swift"}
+    """Parse Swift code using the C-family lexer."""
+    return _parse_c_family(source_code, "Swift")
 
 def parse_kotlin(source_code: str) -> Dict:
-    """Parse Kotlin code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Function patterns
-    func_patterns = [
-        r'fun\s+(\w+)\s*\(',
-        r'fun\s+[^)]*\)\s*:\s*[^{]*\{',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'interface\s+(\w+)',
-        r'object\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "Kotlin"}
+    """Parse Kotlin code using the C-family lexer."""
+    return _parse_c_family(source_code, "Kotlin")
 
 def parse_scala(source_code: str) -> Dict:
-    """Parse Scala code using regex patterns."""
-    functions = []
-    classes = []
-    
-    # Function patterns
-    func_patterns = [
-        r'def\s+(\w+)\s*\(',
-        r'def\s+(\w+)\s*:',
-    ]
-    
-    # Class patterns
-    class_patterns = [
-        r'class\s+(\w+)',
-        r'trait\s+(\w+)',
-        r'object\s+(\w+)',
-    ]
-    
-    for pattern in func_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            functions.append(match.group(1))
-    
-    for pattern in class_patterns:
-        matches = re.finditer(pattern, source_code, re.MULTILINE)
-        for match in matches:
-            classes.append(match.group(1))
-    
-    return {"code": source_code, "functions": list(set(functions)), "classes": list(set(classes)), "language": "Scala"}
+    """Parse Scala code using the C-family lexer."""
+    return _parse_c_family(source_code, "Scala")
 
 def parse_generic(source_code: str) -> Dict:
     """Generic parser for unsupported languages."""
     return {"code": source_code, "functions": [], "classes": [], "language": "Unknown"}
 
-def extract_notebook_code(file_path):
+def _drop_outputs(node: Dict) -> Dict:
+    """json object hook: discard a cell's outputs/attachments once the cell is decoded."""
+    if "cell_type" in node:
+        node.pop("outputs", None)
+        node.pop("attachments", None)
+    return node
+
+def read_notebook_cells(file_path: str) -> Optional[List[Tuple[int, str]]]:
+    """
+    Return `(cell index, source)` for every non-empty code cell of a notebook.
+
+    The notebook JSON is decoded directly, without nbformat's schema
+    validation. Each cell's outputs are dropped as soon as the cell is
+    decoded, so embedded images are not kept for the whole notebook (the
+    file itself is still read in full). Pre-v4 notebooks fall back to nbformat.
+    """
     try:
-        nb = nbformat.read(file_path, as_version=4)
-        code = ""
-        for cell in nb.cells:
-            if cell.cell_type == "code":
-                code += cell.source + "\n\n"
-        return code.strip()
+        with open(file_path, "rb") as f:
+            nb = json.load(f, object_hook=_drop_outputs)
+
+        if nb.get("nbformat", 4) < 4:
+            legacy = nbformat.read(file_path, as_version=4)
+            cells = [{"cell_type": c.cell_type, "source": c.source} for c in legacy.cells]
+        else:
+            cells = nb.get("cells", [])
+
+        code_cells = []
+        for index, cell in enumerate(cells):
+            if cell.get("cell_type") != "code":
+                continue
+            source = cell.get("source", "")
+            if isinstance(source, list):
+                source = "".join(source)
+            if source.strip():
+                code_cells.append((index, source))
+        return code_cells
     except Exception:
         return None
 
+def chunk_notebook_cells(cells: List[Tuple[int, str]], max_chars: int = NOTEBOOK_CHUNK_CHARS) -> List[Dict]:
+    """
+    Group consecutive code cells into chunks of at most `max_chars` characters
+    (a single oversized cell gets a chunk of its own). Each chunk is a code
+    info dict whose `cells` entry is the index range of the cells it covers.
+    """
+    chunks = []
+    group: List[Tuple[int, str]] = []
+    size = 0
+    for index, source in cells:
+        if group and size + len(source) > max_chars:
+            chunks.append(_notebook_chunk(group))
+            group, size = [], 0
+        group.append((index, source))
+        size += len(source) + 2
+    if group:
+        chunks.append(_notebook_chunk(group))
+    return chunks
+
+def _notebook_chunk(group: List[Tuple[int, str]]) -> Dict:
+    return {
+        "code": "\n\n".join(source for _, source in group).strip(),
+        "functions": [],
+        "classes": [],
+        "language": "Python",
+        "cells": (group[0][0], group[-1][0]),
+    }
+
+def extract_notebook_chunks(file_path: str, max_chars: int = NOTEBOOK_CHUNK_CHARS) -> Optional[List[Dict]]:
+    """Code info for a notebook, split into groups of consecutive cells."""
+    cells = read_notebook_cells(file_path)
+    if cells is None:
+        return None
+    return chunk_notebook_cells(cells, max_chars)
+
+def extract_notebook_code(file_path):
+    cells = read_notebook_cells(file_path)
+    if cells is None:
+        return None
+    return "\n\n".join(source for _, source in cells).strip()
+
 def get_supported_extensions() -> List[str]:
     """Get list of supported file extensions."""
     return [
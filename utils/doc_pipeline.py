@@ -0,0 +1,153 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from agents.base_agent import BATCH_DOC_TOKENS, MAX_BATCH_RESPONSE_TOKENS, batch_has_room, is_small_file
+from utils.code_parser import extract_code_info, extract_notebook_chunks
+from utils.llm_wrapper import LLMError, get_doc_from_llm
+from utils.result_store import ResultStore
+from utils.scheduler import Budget, estimate_tokens, prioritize_files
+
+
+def load_code_infos(path: str) -> List[Dict]:
+    """Code info for a source file; notebooks may yield several cell groups."""
+    if path.endswith(".ipynb"):
+        return extract_notebook_chunks(path) or []
+    code_info = extract_code_info(path)
+    return [code_info] if code_info else []
+
+
+def iter_source_files(source_dir: str, extensions: List[str]):
+    """Yield `(file name, path)` for every file with one of the given extensions."""
+    allowed = [ext.lstrip('.') for ext in extensions]
+    for root, dirs, files in os.walk(source_dir):
+        for file in files:
+            file_extension = file.lower().split('.')[-1] if '.' in file else ''
+            if file_extension in allowed:
+                yield file, os.path.join(root, file)
+
+
+def _ask_llm(prompt: str, budget: Optional[Budget], **kwargs) -> Tuple[str, bool]:
+    """`(answer, failed)` for a prompt; a failed request yields its error message."""
+    try:
+        answer, failed = get_doc_from_llm(prompt, **kwargs), False
+    except LLMError as e:
+        answer, failed = str(e), True
+    if budget:
+        budget.spend(estimate_tokens(prompt) + estimate_tokens(answer))
+    return answer, failed
+
+
+def _request_doc(agent, code_info: Dict, file: str, budget: Optional[Budget]) -> Tuple[str, bool]:
+    return _ask_llm(agent.build_prompt(code_info, file), budget)
+
+
+def _document_file(file: str, rel_path: str, code_infos: List[Dict], agents: List,
+                   store: ResultStore, budget: Optional[Budget]) -> None:
+    for code_info in code_infos:
+        # Large notebooks are documented one group of cells at a time
+        suffix = f" (cells {code_info['cells'][0]}-{code_info['cells'][1]})" if len(code_infos) > 1 else ""
+        for agent in agents:
+            role = agent.role_name + suffix
+            if not store.has(rel_path, role):
+                doc, failed = _request_doc(agent, code_info, file, budget)
+                store.record(rel_path, role, doc, failed=failed)
+
+
+def _document_batch(batch: List[Tuple[str, str, Dict]], agents: List,
+                    store: ResultStore, budget: Optional[Budget]) -> None:
+    """
+    Document several small `(file, rel_path, code_info)` entries with one
+    request per agent. Files the batched response does not cover (or the
+    whole batch, if the request fails) fall back to single-file requests.
+    """
+    for agent in agents:
+        role = agent.role_name
+        missing = [entry for entry in batch if not store.has(entry[1], role)]
+
+        batched: Dict[str, str] = {}
+        if len(missing) > 1:
+            prompt = agent.build_batch_prompt([(rel_path, code_info) for _, rel_path, code_info in missing])
+            response, failed = _ask_llm(prompt, budget, max_tokens=min(BATCH_DOC_TOKENS * len(missing), MAX_BATCH_RESPONSE_TOKENS))
+            if not failed:
+                batched = agent.parse_batch_response(response, [rel_path for _, rel_path, _ in missing])
+
+        for file, rel_path, code_info in missing:
+            doc, failed = batched.get(rel_path), False
+            if doc is None:
+                doc, failed = _request_doc(agent, code_info, file, budget)
+            store.record(rel_path, role, doc, failed=failed)
+
+
+def generate_docs(
+    source_dir: str,
+    extensions: List[str],
+    agents: List,
+    store: ResultStore,
+    prioritize: bool = True,
+    budget: Optional[Budget] = None,
+    on_progress: Optional[Callable[[int, int, str], None]] = None,
+    batch_small_files: bool = True,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> List[str]:
+    """
+    Run every agent over every matching file under `source_dir`, writing
+    each result to `store` under the file's path relative to `source_dir`.
+    Returns the relative paths covered by this run, in the order started.
+
+    With `prioritize`, files are documented in the order given by
+    `utils.scheduler.prioritize_files` (entry points and widely imported
+    modules first, tests last) instead of directory-walk order. Once
+    `budget` is exhausted, or `should_stop` returns True (e.g. a cancelled
+    job), no further files are started. `on_progress` is called with
+    (files done, files total, relative path) once a file's results are in
+    the store.
+
+    With `batch_small_files`, runs of consecutive small files are packed
+    into one request per agent (see `agents.base_agent`) instead of one
+    each; a pending batch is sent before the next large file, so the
+    priority order is kept.
+
+    Results already in the store are reused instead of being requested
+    again, so rerunning with the same store resumes an interrupted run.
+    Failed LLM calls are stored for display but retried on the next run.
+    """
+    files = list(iter_source_files(source_dir, extensions))
+    if prioritize:
+        files = prioritize_files(files, source_dir)
+
+    documented: List[str] = []
+    pending: List[Tuple[str, str, Dict]] = []
+    done = 0
+
+    def report(rel_path: str) -> None:
+        nonlocal done
+        done += 1
+        if on_progress:
+            on_progress(done, len(files), rel_path)
+
+    def flush() -> None:
+        if pending:
+            _document_batch(pending, agents, store, budget)
+            for _, batched_path, _ in pending:
+                report(batched_path)
+            pending.clear()
+
+    for file, path in files:
+        if (budget and budget.exhausted) or (should_stop and should_stop()):
+            break
+        rel_path = os.path.relpath(path, source_dir)
+        code_infos = load_code_infos(path)
+        if code_infos:
+            documented.append(rel_path)
+            if batch_small_files and len(code_infos) == 1 and is_small_file(code_infos[0]):
+                if not batch_has_room([(r, c) for _, r, c in pending], code_infos[0]):
+                    flush()
+                pending.append((file, rel_path, code_infos[0]))
+                continue
+            # Keep the priority order: earlier small files go before this one
+            flush()
+            _document_file(file, rel_path, code_infos, agents, store, budget)
+        report(rel_path)
+
+    flush()
+    return documented
@@ -0,0 +1,231 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+JOBS_DB = ".autodocs_jobs.sqlite3"
+DEFAULT_WORKERS = 4
+# Each worker has at most one request in flight, so the shared limit only
+# matters when it is below the number of workers.
+DEFAULT_LLM_CONCURRENCY = 3
+
+# Workers refresh their running job's `worker_seen_at` this often; a running
+# job not seen for WORKER_TIMEOUT seconds belongs to a worker that died.
+HEARTBEAT_SECONDS = 10.0
+WORKER_TIMEOUT = 60.0
+
+# Job states
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    extensions TEXT NOT NULL,
+    status TEXT NOT NULL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    worker_seen_at REAL,
+    files_done INTEGER NOT NULL DEFAULT 0,
+    files_total INTEGER NOT NULL DEFAULT 0,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    output_dir TEXT,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS llm_waiters (
+    token TEXT PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    pid INTEGER NOT NULL,
+    since REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS llm_slots (
+    token TEXT PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    pid INTEGER NOT NULL,
+    acquired_at REAL NOT NULL
+);
+"""
+
+
+class JobQueue:
+    """
+    Persistent, SQLite-backed queue of documentation jobs.
+
+    Any number of processes may open the same database: submitting, claiming,
+    cancelling and the LLM slot bookkeeping all run in `BEGIN IMMEDIATE`
+    transactions, so two workers never claim the same job or slot. Worker
+    liveness is tracked with a heartbeat timestamp rather than process ids,
+    which works the same on every platform and survives pid reuse.
+    """
+
+    def __init__(self, db_path: str = JOBS_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        with self._transaction() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "worker_seen_at" not in columns:
+                # Databases created before the heartbeat column existed
+                conn.execute("ALTER TABLE jobs ADD COLUMN worker_seen_at REAL")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    # --- Jobs ---
+
+    def submit(self, source: str, extensions: List[str]) -> int:
+        """Queue a git URL or a path to a .zip archive; returns the job id."""
+        kind = "zip" if source.lower().endswith(".zip") else "git"
+        if kind == "zip":
+            if not os.path.isfile(source):
+                raise ValueError(f"Archive not found: {source}")
+            source = os.path.abspath(source)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, source, extensions, status, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, source, json.dumps(extensions), QUEUED, time.time()),
+            )
+            return cursor.lastrowid
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict]:
+        rows = self.conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def claim(self, pid: int) -> Optional[Dict]:
+        """Atomically take the oldest queued job. Jobs left running by a
+        worker that died are put back in the queue first (or marked
+        cancelled, if a cancel was requested before the worker died)."""
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, cancel_requested FROM jobs WHERE status = ? AND COALESCE(worker_seen_at, 0) < ?",
+                (RUNNING, now - WORKER_TIMEOUT),
+            ).fetchall()
+            for row in rows:
+                if row["cancel_requested"]:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, worker_pid = NULL, finished_at = ? WHERE id = ?",
+                        (CANCELLED, now, row["id"]),
+                    )
+                else:
+                    conn.execute("UPDATE jobs SET status = ?, worker_pid = NULL WHERE id = ?", (QUEUED, row["id"]))
+
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND cancel_requested = 0 ORDER BY id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_pid = ?, started_at = ?, worker_seen_at = ? WHERE id = ?",
+                (RUNNING, pid, now, now, row["id"]),
+            )
+        return self.get(row["id"])
+
+    def heartbeat(self, job_id: int) -> None:
+        """Mark the worker running `job_id` as alive."""
+        self.conn.execute("UPDATE jobs SET worker_seen_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def update_progress(self, job_id: int, files_done: int, files_total: int) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET files_done = ?, files_total = ?, worker_seen_at = ? WHERE id = ?",
+            (files_done, files_total, time.time(), job_id),
+        )
+
+    def finish(self, job_id: int, status: str, output_dir: Optional[str] = None, error: Optional[str] = None) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, output_dir = ?, error = ?, finished_at = ?, worker_pid = NULL WHERE id = ?",
+            (status, output_dir, error, time.time(), job_id),
+        )
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued job immediately, or ask a running one to stop after
+        its current file. Returns False if the job had already ended."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] not in (QUEUED, RUNNING):
+                return False
+            if row["status"] == QUEUED:
+                conn.execute("UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?", (CANCELLED, time.time(), job_id))
+            else:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return True
+
+    def cancel_requested(self, job_id: int) -> bool:
+        row = self.conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    # --- Shared LLM concurrency ---
+
+    @contextmanager
+    def llm_slot(self, job_id: int, limit: int, poll_seconds: float = 0.2) -> Iterator[None]:
+        """
+        Hold one of `limit` LLM request slots shared by every worker.
+
+        When slots are scarce they are granted fairly across jobs: the next
+        free slot goes to the waiting job that has made the fewest LLM calls
+        so far (oldest waiter first on ties), so a large job cannot starve
+        the others.
+        """
+        token, pid = uuid.uuid4().hex, os.getpid()
+        self.conn.execute(
+            "INSERT INTO llm_waiters (token, job_id, pid, since) VALUES (?, ?, ?, ?)", (token, job_id, pid, time.time())
+        )
+        try:
+            while not self._try_acquire(token, job_id, pid, limit):
+                time.sleep(poll_seconds)
+        except BaseException:
+            self.conn.execute("DELETE FROM llm_waiters WHERE token = ?", (token,))
+            raise
+        try:
+            yield
+        finally:
+            self.conn.execute("DELETE FROM llm_slots WHERE token = ?", (token,))
+
+    def _try_acquire(self, token: str, job_id: int, pid: int, limit: int) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET worker_seen_at = ? WHERE id = ?", (now, job_id))
+            # Reclaim slots and waiting entries of jobs whose worker died or finished
+            for table in ("llm_slots", "llm_waiters"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE job_id NOT IN "
+                    "(SELECT id FROM jobs WHERE status = ? AND worker_seen_at >= ?)",
+                    (RUNNING, now - WORKER_TIMEOUT),
+                )
+
+            held = conn.execute("SELECT COUNT(*) FROM llm_slots").fetchone()[0]
+            if held >= limit:
+                return False
+            next_waiter = conn.execute(
+                "SELECT w.token FROM llm_waiters w JOIN jobs j ON j.id = w.job_id "
+                "ORDER BY j.llm_calls, w.since LIMIT 1"
+            ).fetchone()
+            if next_waiter is not None and next_waiter["token"] != token:
+                return False
+            conn.execute("DELETE FROM llm_waiters WHERE token = ?", (token,))
+            conn.execute(
+                "INSERT INTO llm_slots (token, job_id, pid, acquired_at) VALUES (?, ?, ?, ?)",
+                (token, job_id, pid, now),
+            )
+            conn.execute("UPDATE jobs SET llm_calls = llm_calls + 1 WHERE id = ?", (job_id,))
+            return True
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from git import Repo
+
+from agents.architect import ArchitectAgent
+from agents.developer import DeveloperAgent
+from agents.user import UserAgent
+from utils.doc_pipeline import generate_docs
+from utils.job_queue import (
+    CANCELLED, DEFAULT_LLM_CONCURRENCY, DEFAULT_WORKERS, DONE, FAILED, HEARTBEAT_SECONDS, JOBS_DB, JobQueue,
+)
+from utils.llm_wrapper import MODEL, set_request_gate
+from utils.md_exporter import write_report, write_split_report
+from utils.result_store import ResultStore, run_key
+
+JOBS_OUTPUT_DIR = "docs/jobs"
+IDLE_POLL_SECONDS = 2.0
+
+
+def _archive_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_job(queue: JobQueue, job: Dict, llm_concurrency: Optional[int]) -> None:
+    """
+    Run parse → agents → export for one claimed job.
+
+    Results go to the same on-disk store the app uses, so a job that is
+    interrupted (or a repo already documented in the app) resumes instead of
+    starting over. With an `llm_concurrency` limit, every LLM request holds
+    a slot of the shared concurrency budget for the duration of the call.
+    """
+    job_id = job["id"]
+    agents = [ArchitectAgent(), DeveloperAgent(), UserAgent()]
+    work_dir = tempfile.mkdtemp(prefix=f"autodocs_job_{job_id}_")
+    try:
+        if job["kind"] == "zip":
+            source_id = f"zip:{_archive_digest(job['source'])}"
+            with zipfile.ZipFile(job["source"], "r") as zip_ref:
+                zip_ref.extractall(work_dir)
+        else:
+            repo = Repo.clone_from(job["source"], work_dir, depth=1)
+            source_id = f"git:{job['source']}@{repo.head.commit.hexsha}"
+
+        extensions = json.loads(job["extensions"])
+        store = ResultStore(run_key(source_id, extensions, [a.role_name for a in agents], MODEL))
+        if llm_concurrency is not None:
+            set_request_gate(lambda: queue.llm_slot(job_id, llm_concurrency))
+
+        generate_docs(
+            work_dir, extensions, agents, store,
+            on_progress=lambda done, total, _: queue.update_progress(job_id, done, total),
+            should_stop=lambda: queue.cancel_requested(job_id),
+        )
+        if queue.cancel_requested(job_id):
+            queue.finish(job_id, CANCELLED)
+            return
+
+        output_dir = os.path.join(JOBS_OUTPUT_DIR, f"job_{job_id}")
+        write_report(store, os.path.join(output_dir, "auto_docs.md"))
+        write_split_report(store, os.path.join(output_dir, "files"))
+        queue.finish(job_id, DONE, output_dir=output_dir)
+    except Exception as e:
+        queue.finish(job_id, FAILED, error=str(e))
+    finally:
+        set_request_gate(None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+@contextmanager
+def _heartbeat(db_path: str, job_id: int) -> Iterator[None]:
+    """Keep a job's heartbeat fresh from a background thread (with its own
+    connection) while it runs, including during clones and long requests."""
+    stop = threading.Event()
+
+    def beat():
+        queue = JobQueue(db_path)
+        while not stop.wait(HEARTBEAT_SECONDS):
+            queue.heartbeat(job_id)
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def worker_loop(db_path: str = JOBS_DB, llm_concurrency: Optional[int] = DEFAULT_LLM_CONCURRENCY,
+                exit_when_idle: bool = False) -> None:
+    """Claim and run jobs one at a time until interrupted (or the queue is empty)."""
+    queue = JobQueue(db_path)
+    try:
+        while True:
+            job = queue.claim(os.getpid())
+            if job is None:
+                if exit_when_idle:
+                    return
+                time.sleep(IDLE_POLL_SECONDS)
+                continue
+            print(f"🛠️ [{os.getpid()}] job {job['id']}: {job['source']}")
+            with _heartbeat(db_path, job["id"]):
+                run_job(queue, job, llm_concurrency)
+            print(f"✅ [{os.getpid()}] job {job['id']}: {queue.get(job['id'])['status']}")
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(workers: int = DEFAULT_WORKERS, db_path: str = JOBS_DB,
+                llm_concurrency: int = DEFAULT_LLM_CONCURRENCY, exit_when_idle: bool = False) -> None:
+    """Start a pool of worker processes sharing one queue and one LLM concurrency budget."""
+    if llm_concurrency >= workers:
+        # A worker sends one request at a time, so the limit can never be reached
+        print(f"⚠️ --llm-concurrency {llm_concurrency} >= --workers {workers}: "
+              f"at most {workers} requests run at once, no shared limit applied")
+        llm_concurrency = None
+    # Create the schema once before the workers race to open the database
+    JobQueue(db_path)
+    processes = [
+        multiprocessing.Process(target=worker_loop, args=(db_path, llm_concurrency, exit_when_idle))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Workers receive the interrupt too; jobs they were running go back to
+        # the queue once their heartbeat is stale
+        for process in processes:
+            process.join()
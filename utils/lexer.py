@@ -0,0 +1,186 @@
+import re
+import time
+from typing import Dict, List, Optional
+
+# Placeholder token emitted for every string/char literal so that the
+# surrounding structure (e.g. `foo("x") {`) is preserved for symbol detection.
+STRING = '""'
+
+# How many tokens to emit between two deadline checks.
+_CHECK_EVERY = 4096
+
+
+class LexerTimeout(Exception):
+    """Raised when tokenizing a file exceeds its time budget."""
+
+    def __init__(self, tokens: List[str]):
+        super().__init__("Lexer time budget exceeded")
+        self.tokens = tokens
+
+
+# Per-language lexical flavour for the C-family languages.
+LANGUAGES: Dict[str, Dict] = {
+    "C++": {"raw_cpp": True, "preprocessor": True},
+    "Java": {"triple_quotes": True},
+    "JavaScript": {"template": True, "regex_literals": True},
+    "TypeScript": {"template": True, "regex_literals": True},
+    "C#": {"triple_quotes": True, "verbatim": True, "preprocessor": True},
+    "Go": {"raw_backtick": True},
+    "Rust": {"nested_comments": True, "raw_rust": True, "rust_chars": True},
+    "Kotlin": {"nested_comments": True, "triple_quotes": True, "backtick_ident": True},
+    "Swift": {"nested_comments": True, "triple_quotes": True, "backtick_ident": True},
+    "Scala": {"nested_comments": True, "triple_quotes": True, "backtick_ident": True},
+    "PHP": {"hash_comments": True},
+}
+
+_SKIPPED = frozenset(("ws", "line_comment", "block_comment", "hash_comment", "preprocessor"))
+_VERBATIM = frozenset(("ident", "number", "op", "other"))
+
+_patterns: Dict[str, "re.Pattern"] = {}
+_COMMENT_DELIMS = re.compile(r'/\*|\*/')
+
+# A JS/TS regex literal, tried only where a `/` cannot be a division. Like
+# string literals, an unterminated one ends at the end of the line.
+_REGEX_LITERAL = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*(?:\]|$))*(?:/[A-Za-z]*|$)', re.MULTILINE)
+# Tokens after which a `/` starts a regex literal rather than a division.
+_REGEX_PRECEDERS = frozenset((
+    "(", ",", "=", ":", "[", "!", "&", "|", "?", "{", "}", ";", "+", "-", "*", "%", "<", ">", "~", "^", "=>",
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw", "yield", "await",
+))
+
+
+def _regex_allowed(tokens: List[str]) -> bool:
+    if not tokens:
+        return True
+    last = tokens[-1]
+    if last in "+-" and len(tokens) > 1 and tokens[-2] == last:
+        return False  # `x++ / y`
+    return last in _REGEX_PRECEDERS
+
+
+def _build_pattern(flavour: Dict) -> "re.Pattern":
+    """Build the master regex for a language. Every alternative is bounded or
+    made of disjoint repetitions, so matching never backtracks super-linearly."""
+    parts = [r'(?P<ws>\s+)', r'(?P<line_comment>//[^\n]*)']
+    if flavour.get("preprocessor"):
+        parts.append(r'(?P<preprocessor>\#(?:[^\n\\]|\\.)*)')
+    if flavour.get("hash_comments"):
+        parts.append(r'(?P<hash_comment>\#(?!\[)[^\n]*)')
+    if flavour.get("nested_comments"):
+        parts.append(r'(?P<nested_comment>/\*)')
+    else:
+        parts.append(r'(?P<block_comment>/\*.*?(?:\*/|\Z))')
+    if flavour.get("raw_cpp"):
+        parts.append(r'(?P<raw_cpp>(?:u8|[uUL])?R"[^()\\\s"]{0,16}\()')
+    if flavour.get("raw_rust"):
+        parts.append(r'(?P<raw_rust>b?r\#*")')
+    if flavour.get("verbatim"):
+        parts.append(r'(?P<verbatim>(?:\$@|@\$|@)"(?:[^"]|"")*(?:"|\Z))')
+    if flavour.get("triple_quotes"):
+        parts.append(r'(?P<triple>"""(?:[^"\\]|\\.|"(?!""))*(?:"""|\Z))')
+    if flavour.get("template") or flavour.get("raw_backtick"):
+        parts.append(r'(?P<backtick>`(?:[^`\\]|\\.)*(?:`|\Z))')
+    elif flavour.get("backtick_ident"):
+        parts.append(r'(?P<bq_ident>`[^`\n]+`)')
+    parts.append(r'(?P<string>\$?"(?:[^"\\\n]|\\.)*(?:"|$))')
+    if flavour.get("rust_chars"):
+        parts.append(r"(?P<char>b?'(?:\\(?:u\{[0-9a-fA-F]{1,6}\}|x[0-9a-fA-F]{2}|.)|[^\\'\n])')")
+    else:
+        parts.append(r"(?P<char>'(?:[^'\\\n]|\\.)*(?:'|$))")
+    parts += [
+        r'(?P<ident>(?:[^\W\d]|\$)(?:\w|\$)*)',
+        r'(?P<number>\d[\w.]*)',
+        r'(?P<op>::|=>|->)',
+        r'(?P<other>.)',
+    ]
+    return re.compile("|".join(parts), re.DOTALL | re.MULTILINE)
+
+
+def _get_pattern(language: str) -> "re.Pattern":
+    if language not in _patterns:
+        _patterns[language] = _build_pattern(LANGUAGES[language])
+    return _patterns[language]
+
+
+def _skip_nested_comment(source: str, pos: int) -> int:
+    """Return the offset just past a (possibly nested) block comment opened
+    right before `pos`, or the end of the source if it is unterminated."""
+    depth = 1
+    for m in _COMMENT_DELIMS.finditer(source, pos):
+        depth += 1 if m.group() == "/*" else -1
+        if depth == 0:
+            return m.end()
+    return len(source)
+
+
+def _skip_raw_string(source: str, pos: int, terminator: str) -> int:
+    end = source.find(terminator, pos)
+    return len(source) if end == -1 else end + len(terminator)
+
+
+def tokenize(source: str, language: str, deadline: Optional[float] = None) -> List[str]:
+    """
+    Tokenize C-family source code in a single linear pass.
+
+    Comments are dropped and every string or char literal is replaced by the
+    `STRING` placeholder, so symbol detection never sees their contents.
+    If `deadline` (a `time.perf_counter()` value) passes, `LexerTimeout` is
+    raised carrying the tokens produced so far.
+    """
+    match = _get_pattern(language).match
+    regex_literals = LANGUAGES[language].get("regex_literals", False)
+    tokens: List[str] = []
+    append = tokens.append
+    pos, n, countdown = 0, len(source), _CHECK_EVERY
+
+    while pos < n:
+        m = None
+        if regex_literals and source[pos] == "/" and _regex_allowed(tokens):
+            m = _REGEX_LITERAL.match(source, pos)
+        if m is None:
+            m = match(source, pos)
+        # A regex literal has no named group and falls through to STRING
+        kind = m.lastgroup
+        pos = m.end()
+
+        if kind in _SKIPPED:
+            pass
+        elif kind in _VERBATIM:
+            append(m.group())
+        elif kind == "nested_comment":
+            pos = _skip_nested_comment(source, pos)
+        elif kind == "raw_cpp":
+            delimiter = m.group()[m.group().index('"') + 1:-1]
+            pos = _skip_raw_string(source, pos, ")" + delimiter + '"')
+            append(STRING)
+        elif kind == "raw_rust":
+            pos = _skip_raw_string(source, pos, '"' + "#" * m.group().count("#"))
+            append(STRING)
+        elif kind == "bq_ident":
+            append(m.group()[1:-1])
+        else:
+            append(STRING)
+
+        countdown -= 1
+        if countdown == 0:
+            countdown = _CHECK_EVERY
+            if deadline is not None and time.perf_counter() > deadline:
+                raise LexerTimeout(tokens)
+
+    return tokens
+
+
+def is_identifier(token: str) -> bool:
+    return token[0].isalpha() or token[0] in "_$"
+
+
+def match_brackets(tokens: List[str], opening: str = "(", closing: str = ")") -> Dict[int, int]:
+    """Map the index of every balanced opening bracket to its closing one."""
+    pairs: Dict[int, int] = {}
+    stack: List[int] = []
+    for i, token in enumerate(tokens):
+        if token == opening:
+            stack.append(i)
+        elif token == closing and stack:
+            pairs[stack.pop()] = i
+    return pairs
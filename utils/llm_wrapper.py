@@ -1,4 +1,5 @@
 import os
+from contextlib import nullcontext
 from dotenv import load_dotenv
 from openai import OpenAI
 import streamlit as st
@@ -6,39 +7,56 @@ import streamlit as st
 load_dotenv()
 
 
-
-api_key = st.secrets["OPENROUTER_API_KEY"]
+# Streamlit secrets first; batch workers run outside Streamlit and use .env
+try:
+    api_key = st.secrets["OPENROUTER_API_KEY"]
+except Exception:
+    api_key = os.getenv("OPENROUTER_API_KEY")
 if api_key is None:
-    raise ValueError("Missing OPENROUTER_API_KEY in secrets")
+    raise ValueError("Missing OPENROUTER_API_KEY in secrets or .env")
 
+MODEL = "mistralai/mistral-7b-instruct"
+
+# Every failure message shown instead of real documentation starts with this.
+LLM_ERROR_PREFIX = "⚠️"
 
-api_key = os.getenv("OPENROUTER_API_KEY")
-if api_key is None:
-    raise ValueError("Missing OPENROUTER_API_KEY in .env")
+
+class LLMError(Exception):
+    """A request produced no documentation; the message is suitable for display."""
 
 client = OpenAI(
     api_key=api_key,
     base_url="https://openrouter.ai/api/v1"
 )
 
-def get_doc_from_llm(prompt: str) -> str:
+# Optional factory of a context manager held around every request, e.g. a
+# slot of the concurrency budget shared by job queue workers.
+_request_gate = None
+
+def set_request_gate(gate) -> None:
+    global _request_gate
+    _request_gate = gate
+
+def get_doc_from_llm(prompt: str, max_tokens: int = 1024) -> str:
+    """Return the model's answer to `prompt`; raise `LLMError` if there is none."""
     try:
-        response = client.chat.completions.create(
-            model="mistralai/mistral-7b-instruct",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
-            max_tokens=1024
-        )
+        with _request_gate() if _request_gate else nullcontext():
+            response = client.chat.completions.create(
+                model=MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.4,
+                max_tokens=max_tokens
+            )
 
         # ✅ Defensive check for type checker and runtime safety
         first_choice = response.choices[0]
         message = getattr(first_choice, "message", None)
-
-        if message and hasattr(message, "content"):
-            return message.content or "⚠️ No content in LLM response."
-
-        return "⚠️ LLM returned unexpected structure."
-
     except Exception as e:
         print("❌ LLM API Error:", e)
-        return "⚠️ Failed to generate documentation due to an API error."
\ No newline at end of file
+        raise LLMError(f"{LLM_ERROR_PREFIX} Failed to generate documentation due to an API error.") from e
+
+    if not (message and hasattr(message, "content")):
+        raise LLMError(f"{LLM_ERROR_PREFIX} LLM returned unexpected structure.")
+    if not message.content:
+        raise LLMError(f"{LLM_ERROR_PREFIX} No content in LLM response.")
+    return message.content
\ No newline at end of file
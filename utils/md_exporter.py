@@ -0,0 +1,120 @@
+import os
+import posixpath
+import shutil
+import tempfile
+import zipfile
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from utils.result_store import ResultStore
+
+# Exports of a store go under EXPORT_ROOT/<store key>/, so concurrent
+# sessions documenting different sources never touch each other's files.
+EXPORT_ROOT = "docs"
+REPORT_NAME = "auto_docs.md"
+SPLIT_NAME = "auto_docs"
+INDEX_NAME = "index.md"
+
+
+def report_path(store: ResultStore) -> str:
+    return os.path.join(EXPORT_ROOT, store.key, REPORT_NAME)
+
+
+def split_dir(store: ResultStore) -> str:
+    return os.path.join(EXPORT_ROOT, store.key, SPLIT_NAME)
+
+
+def _temp_path(path: str) -> str:
+    """A new, unique file next to `path`, to be moved over it once complete."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    os.close(fd)
+    os.chmod(tmp_path, 0o644)  # mkstemp files are private to the owner
+    return tmp_path
+
+
+def write_report(store: ResultStore, output_path: Optional[str] = None) -> str:
+    """
+    Write every stored document into a single Markdown report.
+
+    Sections are streamed to disk one document at a time, so memory use does
+    not grow with the size of the report. The report is written to a
+    temporary file and moved into place, so readers never see a partial file.
+    """
+    output_path = output_path or report_path(store)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = _temp_path(output_path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for file_name in store.files():
+                f.write(f"\n\n### {file_name}\n")
+                for role, content in store.iter_docs(file_name):
+                    f.write(f"\n#### {role}\n{content}\n")
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path
+
+
+def _doc_path(rel_path: str) -> str:
+    """Markdown path (relative to the output directory) for a source file."""
+    return rel_path.replace(os.sep, "/") + ".md"
+
+
+def write_split_report(store: ResultStore, output_dir: Optional[str] = None) -> str:
+    """
+    Write one Markdown file per source file, mirroring the project layout,
+    plus an index grouped by package (directory). Returns the index path.
+    The export is built in a temporary directory and then swapped in place
+    of a previous one.
+    """
+    output_dir = output_dir or split_dir(store)
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(dir=parent, prefix=".split_")
+    try:
+        packages: Dict[str, List[str]] = defaultdict(list)
+        for file_name in store.files():
+            doc_path = _doc_path(file_name)
+            target = os.path.join(build_dir, *doc_path.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(f"# {file_name}\n")
+                for role, content in store.iter_docs(file_name):
+                    f.write(f"\n## {role}\n{content}\n")
+            packages[posixpath.dirname(doc_path)].append(file_name)
+
+        with open(os.path.join(build_dir, INDEX_NAME), "w", encoding="utf-8") as f:
+            f.write("# 📄 AutoDocs Index\n")
+            for package in sorted(packages):
+                f.write(f"\n## {package or '(project root)'}\n\n")
+                for file_name in packages[package]:
+                    f.write(f"- [{posixpath.basename(file_name.replace(os.sep, '/'))}]({_doc_path(file_name)})\n")
+
+        if os.path.exists(output_dir):
+            old_dir = build_dir + "_old"
+            os.replace(output_dir, old_dir)
+            os.replace(build_dir, output_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            os.replace(build_dir, output_dir)
+    finally:
+        if os.path.exists(build_dir):
+            shutil.rmtree(build_dir, ignore_errors=True)
+    return os.path.join(output_dir, INDEX_NAME)
+
+
+def zip_directory(directory: str, zip_path: str) -> str:
+    """Zip a directory file by file (nothing is held in memory)."""
+    tmp_path = _temp_path(zip_path)
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for root, dirs, files in os.walk(directory):
+                for file in files:
+                    path = os.path.join(root, file)
+                    zf.write(path, os.path.relpath(path, directory))
+        os.replace(tmp_path, zip_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return zip_path
@@ -3,12 +3,19 @@ import pdfkit
 import uuid
 import os
 
-def markdown_to_pdf(markdown_text: str) -> str | None:
+def markdown_file_to_pdf(markdown_path: str) -> str | None:
+    """Convert a Markdown file to PDF through a temporary HTML file, without
+    keeping the report in session state (the conversion itself still reads
+    the whole file)."""
+    html_path = os.path.splitext(markdown_path)[0] + f"_{uuid.uuid4().hex[:6]}.html"
     try:
-        html = markdown.markdown(markdown_text, extensions=["fenced_code", "tables"])
-        output_path = f"docs/auto_docs_{uuid.uuid4().hex[:6]}.pdf"
-        pdfkit.from_string(html, output_path)
+        markdown.markdownFromFile(input=markdown_path, output=html_path, extensions=["fenced_code", "tables"], encoding="utf-8")
+        output_path = os.path.splitext(markdown_path)[0] + f"_{uuid.uuid4().hex[:6]}.pdf"
+        pdfkit.from_file(html_path, output_path, options={"encoding": "UTF-8"})
         return output_path
     except Exception as e:
         print("❌ PDF Export Error:", e)
-        return None
\ No newline at end of file
+        return None
+    finally:
+        if os.path.exists(html_path):
+            os.remove(html_path)
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer assumed
+    fcntl = None
+
+STORE_DIR = ".autodocs_store"
+
+
+def run_key(source_id: str, extensions: List[str], roles: List[str], model: str) -> str:
+    """
+    Identify a documentation run. Two runs share a key (and so a store)
+    only when they cover the same source (repo URL + commit, or archive
+    hash) with the same languages, agents and model.
+    """
+    settings = {
+        "source": source_id,
+        "extensions": sorted(extensions),
+        "roles": list(roles),
+        "model": model,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ResultStore:
+    """
+    On-disk store of agent results, keyed by (relative file path, agent).
+
+    Documents are appended to `docs.jsonl` and located through a small
+    append-only `index.jsonl` of byte offsets, so opening a store only reads
+    the index and each document is read from disk when it is needed. Both
+    files are fsync'd after every result, which makes the store double as the
+    run's checkpoint: a crash or restart loses at most the request that was
+    in flight. A truncated last index line from an interrupted write is
+    ignored.
+
+    Several processes may write to the same store (two app sessions on the
+    same repo, or batch workers): each append holds an exclusive lock on the
+    store, so a document and its index entry are written together.
+    """
+
+    def __init__(self, key: str, root: str = STORE_DIR):
+        self.key = key
+        self.path = os.path.join(root, key)
+        self._docs_path = os.path.join(self.path, "docs.jsonl")
+        self._index_path = os.path.join(self.path, "index.jsonl")
+        self._lock_path = os.path.join(self.path, ".lock")
+        # (file, agent) -> (offset, length, failed); files keep first-seen order
+        self._index: Dict[Tuple[str, str], Tuple[int, int, bool]] = {}
+        self._files: Dict[str, Dict[str, None]] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._add(entry["file"], entry["agent"], entry["offset"], entry["length"], entry.get("failed", False))
+                except (ValueError, KeyError):
+                    continue
+
+    def _add(self, file: str, agent: str, offset: int, length: int, failed: bool) -> None:
+        self._index[(file, agent)] = (offset, length, failed)
+        self._files.setdefault(file, {})[agent] = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self._lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def record(self, file: str, agent: str, doc: str, failed: bool = False) -> None:
+        """Durably store a result. Failed results are kept for display but
+        do not count for `has`, so a resumed run requests them again."""
+        os.makedirs(self.path, exist_ok=True)
+        data = (json.dumps(doc, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._locked():
+            with open(self._docs_path, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = {"file": file, "agent": agent, "offset": offset, "length": len(data), "failed": failed}
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+            with open(self._index_path, "ab+") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Terminate a line cut short by a crash before appending
+                        line = b"\n" + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        self._add(file, agent, offset, len(data), failed)
+
+    def _read(self, offset: int, length: int) -> str:
+        with open(self._docs_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length).decode("utf-8"))
+
+    def has(self, file: str, agent: str) -> bool:
+        """Whether (file, agent) already has a successfully generated result."""
+        entry = self._index.get((file, agent))
+        return entry is not None and not entry[2]
+
+    def load(self, file: str, agent: str) -> Optional[str]:
+        """Whatever was last stored for (file, agent), including failures."""
+        entry = self._index.get((file, agent))
+        return None if entry is None else self._read(entry[0], entry[1])
+
+    def files(self) -> List[str]:
+        return list(self._files)
+
+    def agents(self, file: str) -> List[str]:
+        return list(self._files.get(file, ()))
+
+    def iter_docs(self, file: str) -> Iterator[Tuple[str, str]]:
+        """Yield (agent, document) for a file, reading one document at a time."""
+        for agent in self.agents(file):
+            yield agent, self.load(file, agent)
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for _, _, failed in self._index.values() if not failed)
@@ -0,0 +1,124 @@
+import math
+import os
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# File stems that usually mark an application's entry point.
+ENTRY_POINT_STEMS = {"main", "app", "__main__", "index", "server", "cli", "manage", "program", "lib"}
+
+# Path components and file name patterns that mark tests and fixtures.
+TEST_DIRS = {"test", "tests", "testing", "spec", "specs", "__tests__", "fixtures", "fixture", "mocks", "__mocks__", "testdata", "examples"}
+TEST_FILE = re.compile(r'(^test_|_test$|^test$|Tests?$|\.(?:test|spec)$|_spec$|^conftest$)')
+
+# Only the head of each file is scanned for imports.
+IMPORT_SCAN_BYTES = 64 * 1024
+
+_IMPORT_LINE = re.compile(
+    r'^[ \t]*(?:import|from|#[ \t]*include|using|use|mod|require|require_once|include|include_once|extern[ \t]+crate)\b[^\n]*'
+    r'|require\(\s*[\'"][^\'"\n]+'
+    r'|^[ \t]*(?:\w+[ \t]+)?"[^"\n]+"[ \t]*$',  # lines of a Go `import (...)` block
+    re.MULTILINE,
+)
+_WORD = re.compile(r'[A-Za-z_]\w*')
+
+# Rough characters-per-token ratio used to account for LLM usage.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class Budget:
+    """Stop a run once an estimated token count or a wall-clock limit is spent."""
+
+    def __init__(self, max_tokens: Optional[int] = None, max_seconds: Optional[float] = None):
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.tokens = 0
+        self.started = time.monotonic()
+
+    def spend(self, tokens: int) -> None:
+        self.tokens += tokens
+
+    @property
+    def exhausted(self) -> bool:
+        if self.max_tokens and self.tokens >= self.max_tokens:
+            return True
+        if self.max_seconds and time.monotonic() - self.started >= self.max_seconds:
+            return True
+        return False
+
+
+def _stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def is_test_file(rel_path: str) -> bool:
+    parts = rel_path.replace("\\", "/").lower().split("/")
+    return any(part in TEST_DIRS for part in parts[:-1]) or bool(TEST_FILE.search(_stem(rel_path)))
+
+
+def import_in_degree(paths: List[str]) -> Dict[str, int]:
+    """
+    Approximate how many other files import each file.
+
+    Import-like lines are scanned in every language and each word in them
+    is matched against file stems (and package directory names for
+    `__init__`/`mod`/`index` files), so `from utils.code_parser import x`,
+    `import "./code_parser"` and `#include "code_parser.h"` all count
+    towards `code_parser.*`.
+    """
+    by_name: Dict[str, List[str]] = defaultdict(list)
+    for path in paths:
+        stem = _stem(path)
+        if stem in ("__init__", "mod", "index"):
+            by_name[os.path.basename(os.path.dirname(path))].append(path)
+        else:
+            by_name[stem].append(path)
+
+    importers: Dict[str, set] = defaultdict(set)
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                head = f.read(IMPORT_SCAN_BYTES)
+        except OSError:
+            continue
+        names = set()
+        for line in _IMPORT_LINE.finditer(head):
+            names.update(_WORD.findall(line.group()))
+        for name in names:
+            for target in by_name.get(name, ()):
+                if target != path:
+                    importers[target].add(path)
+
+    return {path: len(importers.get(path, ())) for path in paths}
+
+
+def score_file(rel_path: str, size: int, in_degree: int) -> float:
+    """Higher scores are documented first."""
+    score = 2.0 * math.log2(1 + in_degree)
+    score += math.log2(1 + size / 1024)
+    if _stem(rel_path).lower() in ENTRY_POINT_STEMS:
+        score += 8.0
+    if is_test_file(rel_path):
+        score -= 12.0
+    # Shallow files (closer to the project root) tend to be more central
+    score -= 0.25 * rel_path.replace("\\", "/").count("/")
+    return score
+
+
+def prioritize_files(files: List[Tuple[str, str]], source_dir: str) -> List[Tuple[str, str]]:
+    """Order `(file name, path)` pairs from most to least important."""
+    paths = [path for _, path in files]
+    in_degree = import_in_degree(paths)
+    scores = {}
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        scores[path] = score_file(os.path.relpath(path, source_dir), size, in_degree[path])
+    return sorted(files, key=lambda item: (-scores[item[1]], item[1]))